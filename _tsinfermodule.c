@@ -417,24 +417,31 @@ TreeSequenceBuilder_init(TreeSequenceBuilder *self, PyObject *args, PyObject *kw
 {
     int ret = -1;
     int err;
-    unsigned long num_sites;
-    unsigned long max_nodes;
-    unsigned long max_edges;
+    Py_ssize_t num_sites;
+    Py_ssize_t max_nodes;
+    Py_ssize_t max_edges;
     static char *kwlist[] = {"num_sites", "max_nodes", "max_edges", NULL};
     int flags = 0;
 
     self->tree_sequence_builder = NULL;
-    if (!PyArg_ParseTupleAndKeywords(args, kwds, "kkk", kwlist,
+    /* Parse as Py_ssize_t rather than unsigned long, which is only 32 bits
+     * on Windows and silently wraps negative values. */
+    if (!PyArg_ParseTupleAndKeywords(args, kwds, "nnn", kwlist,
                 &num_sites, &max_nodes, &max_edges)) {
         goto out;
     }
+    if (num_sites < 0 || max_nodes < 0 || max_edges < 0) {
+        PyErr_SetString(PyExc_ValueError,
+                "num_sites, max_nodes and max_edges must be non-negative");
+        goto out;
+    }
     self->tree_sequence_builder = PyMem_Malloc(sizeof(tree_sequence_builder_t));
     if (self->tree_sequence_builder == NULL) {
         PyErr_NoMemory();
         goto out;
     }
     err = tree_sequence_builder_alloc(self->tree_sequence_builder,
-            num_sites, max_nodes, max_edges, flags);
+            (size_t) num_sites, (size_t) max_nodes, (size_t) max_edges, flags);
     if (err != 0) {
         handle_library_error(err);
         goto out;
@@ -575,6 +582,162 @@ out:
     return ret;
 }
 
+static PyObject *
+TreeSequenceBuilder_add_paths(TreeSequenceBuilder *self, PyObject *args, PyObject *kwds)
+{
+    int err = 0;
+    PyObject *ret = NULL;
+    int flags = 0;
+    PyObject *child = NULL;
+    PyArrayObject *child_array = NULL;
+    PyObject *left = NULL;
+    PyArrayObject *left_array = NULL;
+    PyObject *right = NULL;
+    PyArrayObject *right_array = NULL;
+    PyObject *parent = NULL;
+    PyArrayObject *parent_array = NULL;
+    PyObject *offset = NULL;
+    PyArrayObject *offset_array = NULL;
+    size_t num_paths, num_edges, j;
+    npy_intp *shape;
+    node_id_t *child_data;
+    site_id_t *left_data, *right_data;
+    node_id_t *parent_data;
+    int64_t *offset_data;
+    int compress = 1;
+    int extended_checks = 0;
+
+    static char *kwlist[] = {"child", "left", "right", "parent", "offset",
+        "compress", "extended_checks", NULL};
+
+    if (TreeSequenceBuilder_check_state(self) != 0) {
+        goto out;
+    }
+    if (!PyArg_ParseTupleAndKeywords(args, kwds, "OOOOO|ii", kwlist,
+            &child, &left, &right, &parent, &offset, &compress, &extended_checks)) {
+        goto out;
+    }
+
+    if (compress) {
+        flags = TSI_COMPRESS_PATH;
+    }
+    if (extended_checks) {
+        flags |= TSI_EXTENDED_CHECKS;
+    }
+
+    /* child */
+    child_array = (PyArrayObject *) PyArray_FROM_OTF(child, NPY_INT32, NPY_ARRAY_IN_ARRAY);
+    if (child_array == NULL) {
+        goto out;
+    }
+    if (PyArray_NDIM(child_array) != 1) {
+        PyErr_SetString(PyExc_ValueError, "Dim != 1");
+        goto out;
+    }
+    shape = PyArray_DIMS(child_array);
+    num_paths = shape[0];
+
+    /* left */
+    left_array = (PyArrayObject *) PyArray_FROM_OTF(left, NPY_UINT32, NPY_ARRAY_IN_ARRAY);
+    if (left_array == NULL) {
+        goto out;
+    }
+    if (PyArray_NDIM(left_array) != 1) {
+        PyErr_SetString(PyExc_ValueError, "Dim != 1");
+        goto out;
+    }
+    shape = PyArray_DIMS(left_array);
+    num_edges = shape[0];
+
+    /* right */
+    right_array = (PyArrayObject *) PyArray_FROM_OTF(right, NPY_UINT32, NPY_ARRAY_IN_ARRAY);
+    if (right_array == NULL) {
+        goto out;
+    }
+    if (PyArray_NDIM(right_array) != 1) {
+        PyErr_SetString(PyExc_ValueError, "Dim != 1");
+        goto out;
+    }
+    shape = PyArray_DIMS(right_array);
+    if (shape[0] != num_edges) {
+        PyErr_SetString(PyExc_ValueError, "right wrong size");
+        goto out;
+    }
+
+    /* parent */
+    parent_array = (PyArrayObject *) PyArray_FROM_OTF(parent, NPY_INT32, NPY_ARRAY_IN_ARRAY);
+    if (parent_array == NULL) {
+        goto out;
+    }
+    if (PyArray_NDIM(parent_array) != 1) {
+        PyErr_SetString(PyExc_ValueError, "Dim != 1");
+        goto out;
+    }
+    shape = PyArray_DIMS(parent_array);
+    if (shape[0] != num_edges) {
+        PyErr_SetString(PyExc_ValueError, "parent wrong size");
+        goto out;
+    }
+
+    /* offset */
+    offset_array = (PyArrayObject *) PyArray_FROM_OTF(offset, NPY_INT64, NPY_ARRAY_IN_ARRAY);
+    if (offset_array == NULL) {
+        goto out;
+    }
+    if (PyArray_NDIM(offset_array) != 1) {
+        PyErr_SetString(PyExc_ValueError, "Dim != 1");
+        goto out;
+    }
+    shape = PyArray_DIMS(offset_array);
+    if (shape[0] != num_paths + 1) {
+        PyErr_SetString(PyExc_ValueError, "offset wrong size");
+        goto out;
+    }
+    offset_data = (int64_t *) PyArray_DATA(offset_array);
+    if (offset_data[0] != 0 || offset_data[num_paths] != (int64_t) num_edges) {
+        PyErr_SetString(PyExc_ValueError, "offset must start at 0 and end at num_edges");
+        goto out;
+    }
+    for (j = 0; j < num_paths; j++) {
+        if (offset_data[j] > offset_data[j + 1]) {
+            PyErr_SetString(PyExc_ValueError, "offset must be nondecreasing");
+            goto out;
+        }
+    }
+
+    child_data = (node_id_t *) PyArray_DATA(child_array);
+    left_data = (site_id_t *) PyArray_DATA(left_array);
+    right_data = (site_id_t *) PyArray_DATA(right_array);
+    parent_data = (node_id_t *) PyArray_DATA(parent_array);
+    /* WARNING!! This isn't fully safe as we're using pointers to data that can
+     * be modified in Python. Must make sure that these arrays are not modified
+     * by other threads. */
+    Py_BEGIN_ALLOW_THREADS
+    for (j = 0; j < num_paths; j++) {
+        err = tree_sequence_builder_add_path(self->tree_sequence_builder,
+                child_data[j], (size_t) (offset_data[j + 1] - offset_data[j]),
+                left_data + offset_data[j], right_data + offset_data[j],
+                parent_data + offset_data[j], flags);
+        if (err < 0) {
+            break;
+        }
+    }
+    Py_END_ALLOW_THREADS
+
+    if (err < 0) {
+        handle_library_error(err);
+        goto out;
+    }
+    ret = Py_BuildValue("");
+out:
+    Py_XDECREF(child_array);
+    Py_XDECREF(left_array);
+    Py_XDECREF(right_array);
+    Py_XDECREF(parent_array);
+    Py_XDECREF(offset_array);
+    return ret;
+}
+
 static PyObject *
 TreeSequenceBuilder_add_mutations(TreeSequenceBuilder *self, PyObject *args, PyObject *kwds)
 {
@@ -1149,6 +1312,10 @@ static PyMethodDef TreeSequenceBuilder_methods[] = {
     {"add_path", (PyCFunction) TreeSequenceBuilder_add_path,
         METH_VARARGS|METH_KEYWORDS,
         "Updates the builder with the specified copy results for a given child."},
+    {"add_paths", (PyCFunction) TreeSequenceBuilder_add_paths,
+        METH_VARARGS|METH_KEYWORDS,
+        "Updates the builder with the copy results for several children, where "
+        "the edges for child[j] are in the slice offset[j]:offset[j + 1]."},
     {"add_mutations", (PyCFunction) TreeSequenceBuilder_add_mutations,
         METH_VARARGS|METH_KEYWORDS,
         "Updates the builder with mutations for a given node."},
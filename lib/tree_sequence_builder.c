@@ -202,6 +202,14 @@ tree_sequence_builder_alloc(tree_sequence_builder_t *self,
     memset(self, 0, sizeof(tree_sequence_builder_t));
 
     assert(num_sites < INT32_MAX);
+    /* Fail early if the initial allocations would overflow size_t, rather than
+     * relying on the allocator to catch (or not catch) the wrapped value. */
+    if (nodes_chunk_size > SIZE_MAX / TSI_MAX(sizeof(double), sizeof(edge_t *))
+            || edges_chunk_size > SIZE_MAX / TSI_MAX(sizeof(avl_node_t),
+                sizeof(indexed_edge_t))) {
+        ret = TSI_ERR_NO_MEMORY;
+        goto out;
+    }
 
     self->num_sites = num_sites;
     self->nodes_chunk_size = nodes_chunk_size;
@@ -41,6 +41,7 @@ setup(
             'tsinfer=tsinfer.__main__:main',
         ]
     },
+    python_requires=">=3.7",
     setup_requires=['setuptools_scm', 'numpy'],
     cmdclass={'build_ext': build_ext},
     install_requires=[
@@ -56,15 +57,15 @@ setup(
         "sortedcontainers",
         "attrs",
     ],
+    extras_require={
+        "jit": ["numba"],
+    },
     ext_modules=[_tsinfer_module],
     keywords=[],
     license="GNU GPLv3+",
     classifiers=[
         "Programming Language :: Python :: 3",
-        "Programming Language :: Python :: 3.3",
-        "Programming Language :: Python :: 3.4",
-        "Programming Language :: Python :: 3.5",
-        "Programming Language :: Python :: 3.6",
+        "Programming Language :: Python :: 3.7",
         "License :: OSI Approved :: GNU General Public License v3 or later (GPLv3+)",
         "Development Status :: 3 - Alpha",
         "Environment :: Other Environment",
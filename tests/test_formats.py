@@ -123,6 +123,13 @@ class TestSampleData(unittest.TestCase, DataContainerMixin):
             samples=samples, recombination_rate=1, mutation_rate=10,
             length=sequence_length, random_seed=100)
 
+    def verify_default_compressors(self, input_file):
+        for name, array in input_file.arrays():
+            if name == "sites/genotypes":
+                self.assertEqual(array.compressor, formats.DEFAULT_GENOTYPES_COMPRESSOR)
+            else:
+                self.assertEqual(array.compressor, formats.DEFAULT_COMPRESSOR)
+
     def verify_data_round_trip(self, ts, input_file):
         self.assertGreater(ts.num_sites, 1)
         for pop in ts.populations():
@@ -202,9 +209,7 @@ class TestSampleData(unittest.TestCase, DataContainerMixin):
             input_file = formats.SampleData(
                 path=filename, sequence_length=ts.sequence_length)
             self.verify_data_round_trip(ts, input_file)
-            compressor = formats.DEFAULT_COMPRESSOR
-            for _, array in input_file.arrays():
-                self.assertEqual(array.compressor, compressor)
+            self.verify_default_compressors(input_file)
             with tsinfer.load(filename) as other:
                 self.assertEqual(other, input_file)
 
@@ -264,8 +269,7 @@ class TestSampleData(unittest.TestCase, DataContainerMixin):
         ts = self.get_example_ts(10, 10)
         with formats.SampleData(sequence_length=ts.sequence_length) as sample_data:
             self.verify_data_round_trip(ts, sample_data)
-            for _, array in sample_data.arrays():
-                self.assertEqual(array.compressor, formats.DEFAULT_COMPRESSOR)
+            self.verify_default_compressors(sample_data)
 
     def test_with_metadata_and_individuals(self):
         ts = self.get_example_individuals_ts_with_metadata(5, 2, 10, 1)
@@ -461,6 +465,12 @@ class TestSampleData(unittest.TestCase, DataContainerMixin):
                         for _, array in samples.arrays():
                             self.assertEqual(array.compressor, compressor)
 
+    def test_large_chunk_size_genotypes_compressor(self):
+        chunk_size = int(np.sqrt(blosc.MAX_BUFFERSIZE)) + 1
+        samples = formats.SampleData(sequence_length=1, chunk_size=chunk_size)
+        for _, array in samples.arrays():
+            self.assertEqual(array.compressor, formats.DEFAULT_COMPRESSOR)
+
     def test_multichar_alleles(self):
         ts = self.get_example_ts(5, 17)
         t = ts.dump_tables()
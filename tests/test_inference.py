@@ -2132,3 +2132,37 @@ class TestSequentialAugmentedAncestors(TestAugmentedAncestors):
             self.assertEqual(expected_sample_ancestors, num_sample_ancestors)
             tsinfer.verify(samples, final_ts.simplify())
             ancestors_ts = augmented_ancestors
+
+
+class TestResultBuffer(unittest.TestCase):
+    """
+    Tests for the buffer holding the results of matching.
+    """
+    def test_get_paths(self):
+        results = tsinfer.ResultBuffer()
+
+        def set_path(node_id, left, right, parent):
+            # Paths are stored in the dtypes returned by find_path.
+            results.set_path(
+                node_id, np.array(left, dtype=np.uint32),
+                np.array(right, dtype=np.uint32), np.array(parent, dtype=np.int32))
+
+        set_path(1, [0, 2], [2, 5], [0, 0])
+        set_path(2, [], [], [])
+        set_path(3, [1], [4], [2])
+        left, right, parent, offset = results.get_paths([1, 2, 3])
+        self.assertEqual(left.dtype, np.uint32)
+        self.assertEqual(right.dtype, np.uint32)
+        self.assertEqual(parent.dtype, np.int32)
+        self.assertEqual(list(left), [0, 2, 1])
+        self.assertEqual(list(right), [2, 5, 4])
+        self.assertEqual(list(parent), [0, 0, 2])
+        self.assertEqual(list(offset), [0, 2, 2, 3])
+
+    def test_get_paths_empty(self):
+        results = tsinfer.ResultBuffer()
+        left, right, parent, offset = results.get_paths([])
+        self.assertEqual(left.shape, (0,))
+        self.assertEqual(right.shape, (0,))
+        self.assertEqual(parent.shape, (0,))
+        self.assertEqual(list(offset), [0])
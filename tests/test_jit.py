@@ -0,0 +1,81 @@
+#
+# Copyright (C) 2018 University of Oxford
+#
+# This file is part of tsinfer.
+#
+# tsinfer is free software: you can redistribute it and/or modify
+# it under the terms of the GNU General Public License as published by
+# the Free Software Foundation, either version 3 of the License, or
+# (at your option) any later version.
+#
+# tsinfer is distributed in the hope that it will be useful,
+# but WITHOUT ANY WARRANTY; without even the implied warranty of
+# MERCHANTABILITY or FITNESS FOR A PARTICULAR PURPOSE.  See the
+# GNU General Public License for more details.
+#
+# You should have received a copy of the GNU General Public License
+# along with tsinfer.  If not, see <http://www.gnu.org/licenses/>.
+#
+"""
+Tests for the optional numba-based jit module.
+"""
+import unittest
+
+import msprime
+import numpy as np
+
+import tsinfer
+
+_numba_available = False
+try:
+    import numba  # NOQA
+    import tsinfer.jit as jit
+    _numba_available = True
+except ImportError:
+    pass
+
+
+@unittest.skipIf(not _numba_available, "numba not installed")
+class TestTreeSequenceBuilderView(unittest.TestCase):
+    """
+    Tests that the view of the tree sequence builder is consistent with
+    the data dumped from the C and Python implementations.
+    """
+    def get_matcher(self, engine):
+        ts = msprime.simulate(8, mutation_rate=2, recombination_rate=2, random_seed=3)
+        sample_data = tsinfer.SampleData.from_tree_sequence(ts)
+        ancestor_data = tsinfer.generate_ancestors(sample_data, engine=engine)
+        matcher = tsinfer.AncestorMatcher(sample_data, ancestor_data, engine=engine)
+        matcher.match_ancestors()
+        return matcher
+
+    def verify(self, engine):
+        tsb = self.get_matcher(engine).tree_sequence_builder
+        view = jit.TreeSequenceBuilderView.from_builder(tsb)
+        self.assertEqual(view.num_sites, tsb.num_sites)
+        self.assertEqual(view.num_nodes, tsb.num_nodes)
+        self.assertEqual(view.num_edges, tsb.num_edges)
+        self.assertEqual(view.num_mutations, tsb.num_mutations)
+        left, right, parent, child = tsb.dump_edges()
+        self.assertTrue(np.array_equal(view.edge_left, left))
+        self.assertTrue(np.array_equal(view.edge_child, child))
+        self.assertTrue(view.edge_left.flags.c_contiguous)
+
+        offsets = jit.child_edge_offsets(view.edge_child, view.num_nodes)
+        self.assertEqual(offsets[-1], view.num_edges)
+        for u in range(view.num_nodes):
+            index = np.where(child == u)[0]
+            for site in range(view.num_sites):
+                p = -1
+                for j in index:
+                    if left[j] <= site < right[j]:
+                        p = parent[j]
+                self.assertEqual(p, jit.parent_at_site(
+                    view.edge_left, view.edge_right, view.edge_parent, offsets,
+                    u, site))
+
+    def test_c_engine(self):
+        self.verify(tsinfer.C_ENGINE)
+
+    def test_py_engine(self):
+        self.verify(tsinfer.PY_ENGINE)
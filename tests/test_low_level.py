@@ -19,31 +19,64 @@
 """
 Integrity tests for the low-level module.
 """
-import sys
 import unittest
 
+import numpy as np
+
 import _tsinfer
 
+# A size that is far beyond what any allocator can provide.
+IMPOSSIBLE_SIZE = 2**62
+
 
 class TestOutOfMemory(unittest.TestCase):
     """
     Make sure we raise the correct error when out of memory occurs in
     the library code.
     """
-    @unittest.skipIf(sys.platform == "win32",
-                     "windows seems to allow initializing with insane # of nodes"
-                     " (perhaps memory allocation is optimised out at this stage?)")
     def test_tree_sequence_builder_too_many_nodes(self):
-        big = 2**62
-        self.assertRaises(
-            MemoryError, _tsinfer.TreeSequenceBuilder, num_sites=1, max_nodes=big,
-            max_edges=1)
-
-    @unittest.skipIf(sys.platform == "win32",
-                     "windows raises an assert error not a memory error with 2**62 edges"
-                     " (line 149 of object_heap.c)")
+        with self.assertRaises(MemoryError):
+            _tsinfer.TreeSequenceBuilder(
+                num_sites=1, max_nodes=IMPOSSIBLE_SIZE, max_edges=1)
+
     def test_tree_sequence_builder_too_many_edges(self):
-        big = 2**62
-        self.assertRaises(
-            MemoryError, _tsinfer.TreeSequenceBuilder, num_sites=1, max_nodes=1,
-            max_edges=big)
+        with self.assertRaises(MemoryError):
+            _tsinfer.TreeSequenceBuilder(
+                num_sites=1, max_nodes=1, max_edges=IMPOSSIBLE_SIZE)
+
+
+class TestTreeSequenceBuilder(unittest.TestCase):
+    """
+    Tests for the argument handling in the low-level TreeSequenceBuilder.
+    """
+    def test_negative_sizes(self):
+        for bad in [-1, -2**62]:
+            with self.assertRaises(ValueError):
+                _tsinfer.TreeSequenceBuilder(num_sites=bad, max_nodes=1, max_edges=1)
+            with self.assertRaises(ValueError):
+                _tsinfer.TreeSequenceBuilder(num_sites=1, max_nodes=bad, max_edges=1)
+            with self.assertRaises(ValueError):
+                _tsinfer.TreeSequenceBuilder(num_sites=1, max_nodes=1, max_edges=bad)
+
+    def test_bad_types(self):
+        for bad in [None, "1", 1.0]:
+            with self.assertRaises(TypeError):
+                _tsinfer.TreeSequenceBuilder(num_sites=bad, max_nodes=1, max_edges=1)
+
+    def test_add_paths_bad_offset(self):
+        tsb = _tsinfer.TreeSequenceBuilder(num_sites=2, max_nodes=4, max_edges=4)
+        tsb.add_node(time=2)
+        tsb.add_node(time=1)
+        left = np.array([0], dtype=np.uint32)
+        right = np.array([2], dtype=np.uint32)
+        parent = np.array([0], dtype=np.int32)
+        child = np.array([1], dtype=np.int32)
+        for bad_offset in [[0], [0, 1, 1], [1, 1], [0, 0], [0, 2]]:
+            with self.assertRaises(ValueError):
+                tsb.add_paths(child, left, right, parent, bad_offset)
+        for bad_offset in [[-1, 2, 1], [0, 2, 1]]:
+            with self.assertRaises(ValueError):
+                tsb.add_paths([1, 1], [0, 1], [1, 2], [0, 0], bad_offset)
+        self.assertEqual(tsb.num_edges, 0)
+        tsb.add_paths(child, left, right, parent, [0, 1])
+        self.assertEqual(tsb.num_edges, 1)
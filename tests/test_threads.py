@@ -0,0 +1,80 @@
+#
+# Copyright (C) 2018 University of Oxford
+#
+# This file is part of tsinfer.
+#
+# tsinfer is free software: you can redistribute it and/or modify
+# it under the terms of the GNU General Public License as published by
+# the Free Software Foundation, either version 3 of the License, or
+# (at your option) any later version.
+#
+# tsinfer is distributed in the hope that it will be useful,
+# but WITHOUT ANY WARRANTY; without even the implied warranty of
+# MERCHANTABILITY or FITNESS FOR A PARTICULAR PURPOSE.  See the
+# GNU General Public License for more details.
+#
+# You should have received a copy of the GNU General Public License
+# along with tsinfer.  If not, see <http://www.gnu.org/licenses/>.
+#
+"""
+Tests for the threading utilities.
+"""
+import unittest
+
+import tsinfer.threads as threads
+
+
+class TestPrefetchIterator(unittest.TestCase):
+    """
+    Tests for the iterator that reads ahead on a background thread.
+    """
+    def test_items(self):
+        for n in [0, 1, 10, 100]:
+            for buffer_size in [1, 2, 8]:
+                it = threads.PrefetchIterator(iter(range(n)), buffer_size=buffer_size)
+                self.assertEqual(list(it), list(range(n)))
+                self.assertEqual(list(it), [])
+
+    def test_none_items(self):
+        items = [None, 1, None]
+        self.assertEqual(list(threads.PrefetchIterator(iter(items))), items)
+
+    def test_exception_propagated(self):
+        def generator():
+            yield 0
+            yield 1
+            raise OSError("read failed")
+
+        it = threads.PrefetchIterator(generator())
+        self.assertEqual(next(it), 0)
+        self.assertEqual(next(it), 1)
+        with self.assertRaises(OSError) as context:
+            next(it)
+        self.assertEqual(str(context.exception), "read failed")
+        with self.assertRaises(StopIteration):
+            next(it)
+
+    def test_exception_in_for_loop(self):
+        def generator():
+            yield 0
+            raise ValueError("bad item")
+
+        items = []
+        with self.assertRaises(ValueError):
+            for item in threads.PrefetchIterator(generator()):
+                items.append(item)
+        self.assertEqual(items, [0])
+
+    def test_close_early(self):
+        with threads.PrefetchIterator(iter(range(1000)), buffer_size=2) as it:
+            self.assertEqual(next(it), 0)
+        self.assertFalse(it._thread.is_alive())
+        self.assertIsNone(it._iterator)
+        with self.assertRaises(StopIteration):
+            next(it)
+
+    def test_close_finished(self):
+        it = threads.PrefetchIterator(iter(range(5)))
+        self.assertEqual(list(it), list(range(5)))
+        it.close()
+        self.assertFalse(it._thread.is_alive())
@@ -21,11 +21,7 @@ Tree sequence inference.
 
 Python 3 only.
 """
-
-import sys
-
-if sys.version_info[0] < 3:
-    raise Exception("Python 3 only")
+import importlib as _importlib
 
 __version__ = "undefined"
 try:
@@ -34,9 +30,60 @@ try:
 except ImportError:
     pass
 
-from .inference import *  # NOQA
-from .formats import *  # NOQA
-from .eval_util import *  # NOQA
 from .exceptions import *  # NOQA
 from .constants import *  # NOQA
-from .cli import get_cli_parser  # NOQA
+
+# The remaining public API is loaded lazily on first attribute access (PEP 562),
+# so that importing tsinfer doesn't pull in numpy, zarr, tskit and the _tsinfer
+# C extension until they are actually needed.
+_LAZY_EXPORTS = {
+    "inference": [
+        "is_pc_ancestor", "is_srb_ancestor", "count_pc_ancestors",
+        "count_srb_ancestors", "DummyProgress", "DummyProgressMonitor", "verify",
+        "infer", "generate_ancestors", "match_ancestors", "augment_ancestors",
+        "match_samples", "AncestorsGenerator", "Matcher", "AncestorMatcher",
+        "SampleMatcher", "ResultBuffer", "minimise"],
+    "formats": [
+        "FORMAT_NAME_KEY", "FORMAT_VERSION_KEY", "FINALISED_KEY",
+        "DEFAULT_COMPRESSOR", "DEFAULT_GENOTYPES_COMPRESSOR", "DEFAULT_MAX_FILE_SIZE",
+        "remove_lmdb_lockfile",
+        "BufferedItemWriter", "zarr_summary", "chunk_iterator", "DataContainer",
+        "Site", "Variant", "Individual", "SampleData", "Ancestor", "AncestorData",
+        "load"],
+    "eval_util": [
+        "insert_errors", "kc_distance", "tree_pairs", "compare", "strip_singletons",
+        "insert_perfect_mutations", "get_ancestral_haplotypes",
+        "get_ancestor_descriptors", "assert_smc", "assert_single_recombination",
+        "build_simulated_ancestors", "print_tree_pairs", "subset_sites",
+        "make_ancestors_ts", "check_ancestors_ts", "extract_ancestors",
+        "insert_srb_ancestors", "run_perfect_inference", "count_sample_child_edges",
+        "node_span", "mean_sample_ancestry", "snip_centromere"],
+    "cli": ["get_cli_parser"],
+}
+_LAZY = {
+    name: module for module, names in _LAZY_EXPORTS.items() for name in names}
+__all__ = [
+    "TsinferException", "FileError", "FileFormatError",
+    "C_ENGINE", "PY_ENGINE", "NODE_IS_PC_ANCESTOR", "NODE_IS_SRB_ANCESTOR",
+    "NODE_IS_SAMPLE_ANCESTOR"] + list(_LAZY)
+# The jit submodule requires numba, and is therefore only importable on demand.
+_SUBMODULES = {
+    "algorithm", "cli", "eval_util", "formats", "inference", "jit", "provenance",
+    "threads"}
+
+
+def __getattr__(name):
+    if name in _LAZY:
+        module = _importlib.import_module("." + _LAZY[name], __name__)
+        value = getattr(module, name)
+    elif name in _SUBMODULES:
+        value = _importlib.import_module("." + name, __name__)
+    else:
+        raise AttributeError("module {!r} has no attribute {!r}".format(
+            __name__, name))
+    globals()[name] = value
+    return value
+
+
+def __dir__():
+    return sorted(set(globals()) | set(_LAZY) | _SUBMODULES)
@@ -374,6 +374,15 @@ class TreeSequenceBuilder(object):
         if extended_checks:
             self.check_state()
 
+    def add_paths(
+            self, child, left, right, parent, offset, compress=True,
+            extended_checks=False):
+        for j, c in enumerate(child):
+            s = slice(offset[j], offset[j + 1])
+            self.add_path(
+                c, left[s], right[s], parent[s], compress=compress,
+                extended_checks=extended_checks)
+
     def update_node_time(self, child_id, pc_parent_id):
         """
         Updates the node time for the specified pc parent node ID.
@@ -55,6 +55,18 @@ FINALISED_KEY = "finalised"
 # bigger than 2GB, which can occur in a larger instances.
 DEFAULT_COMPRESSOR = numcodecs.Zstd()
 
+# The sample genotype matrix is made up of small integers that are strongly
+# correlated between samples, which bitshuffling exposes to the compressor.
+# This is used in place of DEFAULT_COMPRESSOR for the genotypes when no
+# compressor is specified, unless the genotype chunks (chunk_size**2 bytes)
+# are too large for the Blosc buffer size limit.
+DEFAULT_GENOTYPES_COMPRESSOR = numcodecs.Blosc(
+    cname="zstd", clevel=5, shuffle=numcodecs.Blosc.BITSHUFFLE)
+
+# Default value for the compressor argument, so that we can tell whether a
+# compressor has been explicitly specified.
+_DEFAULT = object()
+
 # Lmdb on windows allocates the entire file size rather than
 # growing dynamically (see https://github.com/mozilla/lmdb-rs/issues/40).
 # For the default setting on windows, we therefore hard code a smaller
@@ -247,13 +259,20 @@ class DataContainer(object):
     FORMAT_VERSION = None
 
     def __init__(
-            self, path=None, num_flush_threads=0, compressor=DEFAULT_COMPRESSOR,
+            self, path=None, num_flush_threads=0, compressor=_DEFAULT,
             chunk_size=1024, max_file_size=None):
         self._mode = self.BUILD_MODE
         self._num_flush_threads = num_flush_threads
         self._chunk_size = max(1, chunk_size)
         self._metadata_codec = numcodecs.JSON()
-        self._compressor = compressor
+        if compressor is _DEFAULT:
+            self._compressor = DEFAULT_COMPRESSOR
+            self._genotypes_compressor = DEFAULT_GENOTYPES_COMPRESSOR
+            if self._chunk_size**2 > numcodecs.blosc.MAX_BUFFERSIZE:
+                self._genotypes_compressor = DEFAULT_COMPRESSOR
+        else:
+            self._compressor = compressor
+            self._genotypes_compressor = compressor
         self.data = zarr.group()
         self.path = path
         if path is not None:
@@ -715,7 +734,10 @@ class SampleData(DataContainer):
         instance to use for compressing data. Any codec may be used, but
         problems may occur with very large datasets on certain codecs as
         they cannot compress buffers >2GB. If None, do not use any compression.
-        Default=:class:`numcodecs.zstd.Zstd`.
+        If specified, the compressor is used for all arrays. If not specified,
+        :class:`numcodecs.zstd.Zstd` is used, except for the genotype matrix,
+        which is compressed using :class:`numcodecs.blosc.Blosc` with zstd and
+        bitshuffling.
     :param int chunk_size: The chunk size used for
         `zarr arrays <http://zarr.readthedocs.io/>`_. This affects
         compression level and algorithm performance. Default=1024.
@@ -781,7 +803,7 @@ class SampleData(DataContainer):
             dtype=np.float64)
         sites_group.create_dataset(
             "genotypes", shape=(0, 0), chunks=(self._chunk_size, self._chunk_size),
-            compressor=self._compressor, dtype=np.int8)
+            compressor=self._genotypes_compressor, dtype=np.int8)
         sites_group.create_dataset(
             "inference", shape=(0,), chunks=chunks, compressor=self._compressor,
             dtype=bool)
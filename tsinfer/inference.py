@@ -105,6 +105,33 @@ def _get_progress_monitor(progress_monitor):
     return progress_monitor
 
 
+def _position_map(position, sequence_length):
+    """
+    Returns the array mapping site indexes to genomic coordinates, which is
+    used to convert edge coordinates between the two. The first value is 0
+    and the last is the sequence length.
+    """
+    pos_map = np.empty(position.shape[0] + 1, dtype=np.float64)
+    pos_map[-1] = sequence_length
+    pos_map[1:-1] = position[1:]
+    pos_map[0] = 0
+    return pos_map
+
+
+def _cache_aligned_rows(num_rows, row_length, dtype, alignment=64):
+    """
+    Returns a list of num_rows zeroed arrays of the specified length, allocated
+    from a single buffer so that each row starts on its own cache line. This
+    stops threads writing to their own row from contending for cache lines.
+    """
+    itemsize = np.dtype(dtype).itemsize
+    stride = -(-row_length * itemsize // alignment) * alignment // itemsize
+    buff = np.zeros(num_rows * stride + alignment // itemsize, dtype=dtype)
+    offset = (-buff.ctypes.data % alignment) // itemsize
+    pool = buff[offset: offset + num_rows * stride].reshape((num_rows, stride))
+    return [pool[j, :row_length] for j in range(num_rows)]
+
+
 def verify(samples, tree_sequence, progress_monitor=None):
     """
     verify(samples, tree_sequence)
@@ -124,16 +151,18 @@ def verify(samples, tree_sequence, progress_monitor=None):
         raise ValueError("numbers of samples not equal")
     if samples.sequence_length != tree_sequence.sequence_length:
         raise ValueError("Sequence lengths not equal")
+    position = samples.sites_position[:]
+    alleles = samples.sites_alleles[:]
     progress = progress_monitor.get("verify", tree_sequence.num_sites)
-    for var1, var2 in zip(samples.variants(), tree_sequence.variants()):
-        if var1.site.position != var2.site.position:
+    for (j, genotypes), var in zip(samples.genotypes(), tree_sequence.variants()):
+        if position[j] != var.site.position:
             raise ValueError("site positions not equal: {} != {}".format(
-                var1.site.position, var2.site.position))
-        if var1.alleles != var2.alleles:
+                position[j], var.site.position))
+        if tuple(alleles[j]) != var.alleles:
             raise ValueError("alleles not equal: {} != {}".format(
-                var1.alleles, var2.alleles))
-        if not np.array_equal(var1.genotypes, var2.genotypes):
-            raise ValueError("Genotypes not equal at site {}".format(var1.site.id))
+                tuple(alleles[j]), var.alleles))
+        if not np.array_equal(genotypes, var.genotypes):
+            raise ValueError("Genotypes not equal at site {}".format(j))
         progress.update()
     progress.close()
 
@@ -360,8 +389,13 @@ class AncestorsGenerator(object):
         """
         logger.info("Starting addition of {} sites".format(self.num_sites))
         progress = self.progress_monitor.get("ga_add_sites", self.num_sites)
-        for j, variant in enumerate(self.sample_data.variants(inference_sites=True)):
-            self.ancestor_builder.add_site(j, variant.site.time, variant.genotypes)
+        # Read the times for all inference sites up front, rather than building
+        # a full Variant object (with alleles and metadata) for every site.
+        inference = self.sample_data.sites_inference[:]
+        site_time = self.sample_data.sites_time[:][inference]
+        iterator = self.sample_data.genotypes(inference_sites=True)
+        for j, (_, genotypes) in enumerate(iterator):
+            self.ancestor_builder.add_site(j, site_time[j], genotypes)
             progress.update()
         progress.close()
         logger.info("Finished adding sites")
@@ -372,11 +406,12 @@ class AncestorsGenerator(object):
             before = time.perf_counter()
             s, e = self.ancestor_builder.make_ancestor(focal_sites, a)
             duration = time.perf_counter() - before
-            logger.debug(
-                "Made ancestor in {:.2f}s at timepoint {} (epoch {}) "
-                "from {} to {} (len={}) with {} focal sites ({})".format(
-                    duration, t, self.timepoint_to_epoch[t], s, e, e - s,
-                    focal_sites.shape[0], focal_sites))
+            if logger.isEnabledFor(logging.DEBUG):
+                logger.debug(
+                    "Made ancestor in {:.2f}s at timepoint {} (epoch {}) "
+                    "from {} to {} (len={}) with {} focal sites ({})".format(
+                        duration, t, self.timepoint_to_epoch[t], s, e, e - s,
+                        focal_sites.shape[0], focal_sites))
             self.ancestor_data.add_ancestor(
                 start=s, end=e, time=t, focal_sites=focal_sites,
                 haplotype=a[s:e])
@@ -511,7 +546,7 @@ class Matcher(object):
 
         # Allocate the matchers and statistics arrays.
         num_threads = max(1, self.num_threads)
-        self.match = [np.zeros(self.num_sites, np.int8) for _ in range(num_threads)]
+        self.match = _cache_aligned_rows(num_threads, self.num_sites, np.int8)
         self.results = ResultBuffer()
         self.mean_traceback_size = np.zeros(num_threads)
         self.num_matches = np.zeros(num_threads)
@@ -532,9 +567,13 @@ class Matcher(object):
         self.match_progress.update()
         self.mean_traceback_size[thread_index] += matcher.mean_traceback_size
         self.num_matches[thread_index] += 1
-        logger.debug("matched node {}; num_edges={} tb_size={:.2f} match_mem={}".format(
-            child_id, left.shape[0], matcher.mean_traceback_size,
-            humanize.naturalsize(matcher.total_memory, binary=True)))
+        # This is called for every ancestor and sample, so avoid formatting the
+        # message (and querying the matcher's memory) unless it will be emitted.
+        if logger.isEnabledFor(logging.DEBUG):
+            logger.debug(
+                "matched node {}; num_edges={} tb_size={:.2f} match_mem={}".format(
+                    child_id, left.shape[0], matcher.mean_traceback_size,
+                    humanize.naturalsize(matcher.total_memory, binary=True)))
         return left, right, parent
 
     def restore_tree_sequence_builder(self, ancestors_ts):
@@ -552,8 +591,7 @@ class Matcher(object):
             raise ValueError("All nodes must have time > 0")
         edges = tables.edges
         # Get the indexes into the position array.
-        pos_map = np.hstack([position, [tables.sequence_length]])
-        pos_map[0] = 0
+        pos_map = _position_map(position, tables.sequence_length)
         left = np.searchsorted(pos_map, edges.left)
         if np.any(pos_map[left] != edges.left):
             raise ValueError("Invalid left coordinates")
@@ -596,16 +634,15 @@ class Matcher(object):
         num_pc_ancestors = count_pc_ancestors(flags)
         tables.nodes.set_columns(flags=flags, time=times)
 
-        position = self.ancestor_data.sites_position
-        pos_map = np.hstack([position, [tables.sequence_length]])
-        pos_map[0] = 0
+        position = self.ancestor_data.sites_position[:]
+        pos_map = _position_map(position, tables.sequence_length)
         left, right, parent, child = tsb.dump_edges()
         tables.edges.set_columns(
             left=pos_map[left], right=pos_map[right], parent=parent, child=child)
 
         tables.sites.set_columns(
             position=position,
-            ancestral_state=np.zeros(tsb.num_sites, dtype=np.int8) + ord('0'),
+            ancestral_state=np.full(tsb.num_sites, ord('0'), dtype=np.int8),
             ancestral_state_offset=np.arange(tsb.num_sites + 1, dtype=np.uint32))
         site, node, derived_state, parent = tsb.dump_mutations()
         derived_state += ord('0')
@@ -735,9 +772,7 @@ class Matcher(object):
             metadata_offset=tables.nodes.metadata_offset)
         num_pc_ancestors = count_pc_ancestors(tables.nodes.flags) - num_pc_ancestors
 
-        position = tables.sites.position
-        pos_map = np.hstack([position, [tables.sequence_length]])
-        pos_map[0] = 0
+        pos_map = _position_map(tables.sites.position, tables.sequence_length)
         left, right, parent, child = tsb.dump_edges()
         tables.edges.set_columns(
             left=pos_map[left], right=pos_map[right], parent=parent, child=child)
@@ -824,9 +859,8 @@ class Matcher(object):
                 tables.edges.add_row(0, tables.sequence_length, root, sample_id)
         else:
             # Subset down to the inference sites and map back to the site indexes.
-            position = position[inference_sites]
-            pos_map = np.hstack([position, [tables.sequence_length]])
-            pos_map[0] = 0
+            pos_map = _position_map(
+                position[inference_sites], tables.sequence_length)
             tables.edges.set_columns(
                 left=pos_map[left], right=pos_map[right], parent=parent, child=child)
 
@@ -865,18 +899,22 @@ class AncestorMatcher(Matcher):
         # Consume the first ancestor.
         a = next(self.ancestors, None)
         self.num_epochs = 0
+        self.epoch_start = np.zeros(0, dtype=np.int64)
+        self.epoch_end = np.zeros(0, dtype=np.int64)
         if a is not None:
             assert np.array_equal(a.haplotype, np.zeros(self.num_sites, dtype=np.int8))
-            # Create a list of all ID ranges in each epoch.
+            # The ancestor IDs in epoch j are epoch_start[j] to epoch_end[j].
             breaks = np.where(self.epoch[1:] != self.epoch[:-1])[0]
-            start = np.hstack([[0], breaks + 1])
-            end = np.hstack([breaks + 1, [self.num_ancestors]])
-            self.epoch_slices = np.vstack([start, end]).T
-            self.num_epochs = self.epoch_slices.shape[0]
+            self.num_epochs = breaks.shape[0] + 1
+            self.epoch_start = np.zeros(self.num_epochs, dtype=np.int64)
+            self.epoch_start[1:] = breaks + 1
+            self.epoch_end = np.zeros(self.num_epochs, dtype=np.int64)
+            self.epoch_end[:-1] = breaks + 1
+            self.epoch_end[-1] = self.num_ancestors
         self.start_epoch = 1
 
     def __epoch_info_dict(self, epoch_index):
-        start, end = self.epoch_slices[epoch_index]
+        start, end = self.epoch_start[epoch_index], self.epoch_end[epoch_index]
         return collections.OrderedDict([
             ("epoch", str(self.epoch[start])),
             ("nanc", str(end - start))
@@ -891,16 +929,18 @@ class AncestorMatcher(Matcher):
         assert ancestor.haplotype.shape[0] == (end - start)
         haplotype[start: end] = ancestor.haplotype
         assert np.all(haplotype[focal_sites] == 1)
-        logger.debug(
-            "Finding path for ancestor {}; start={} end={} num_focal_sites={}".format(
-                ancestor.id, start, end, focal_sites.shape[0]))
+        if logger.isEnabledFor(logging.DEBUG):
+            logger.debug(
+                "Finding path for ancestor {}; start={} end={} "
+                "num_focal_sites={}".format(
+                    ancestor.id, start, end, focal_sites.shape[0]))
         haplotype[focal_sites] = 0
         left, right, parent = self._find_path(
                 ancestor.id, haplotype, start, end, thread_index)
         assert np.all(self.match[thread_index][start: end] == haplotype[start: end])
 
     def __start_epoch(self, epoch_index):
-        start, end = self.epoch_slices[epoch_index]
+        start, end = self.epoch_start[epoch_index], self.epoch_end[epoch_index]
         info = collections.OrderedDict([
             ("epoch", str(self.epoch[start])),
             ("nanc", str(end - start))
@@ -909,42 +949,47 @@ class AncestorMatcher(Matcher):
         self.tree_sequence_builder.freeze_indexes()
 
     def __complete_epoch(self, epoch_index):
-        start, end = map(int, self.epoch_slices[epoch_index])
+        start, end = self.epoch_start[epoch_index], self.epoch_end[epoch_index]
         num_ancestors_in_epoch = end - start
         current_time = self.epoch[start]
         nodes_before = self.tree_sequence_builder.num_nodes
 
+        # Insert all the paths for the epoch in a single call to the builder.
+        child = np.arange(start, end, dtype=np.int32)
+        left, right, parent, offset = self.results.get_paths(range(start, end))
+        self.tree_sequence_builder.add_paths(
+            child, left, right, parent, offset, compress=self.path_compression,
+            extended_checks=self.extended_checks)
         for child_id in range(start, end):
-            left, right, parent = self.results.get_path(child_id)
-            self.tree_sequence_builder.add_path(
-                child_id, left, right, parent,
-                compress=self.path_compression,
-                extended_checks=self.extended_checks)
             site, derived_state = self.results.get_mutations(child_id)
             self.tree_sequence_builder.add_mutations(child_id, site, derived_state)
 
-        extra_nodes = self.tree_sequence_builder.num_nodes - nodes_before
-        mean_memory = np.mean([matcher.total_memory for matcher in self.matcher])
-        logger.debug(
-            "Finished epoch {} with {} ancestors; {} extra nodes inserted; "
-            "mean_tb_size={:.2f} edges={}; mean_matcher_mem={}".format(
-                current_time, num_ancestors_in_epoch, extra_nodes,
-                np.sum(self.mean_traceback_size) / np.sum(self.num_matches),
-                self.tree_sequence_builder.num_edges,
-                humanize.naturalsize(mean_memory, binary=True)))
+        if logger.isEnabledFor(logging.DEBUG):
+            extra_nodes = self.tree_sequence_builder.num_nodes - nodes_before
+            mean_memory = np.mean([matcher.total_memory for matcher in self.matcher])
+            logger.debug(
+                "Finished epoch {} with {} ancestors; {} extra nodes inserted; "
+                "mean_tb_size={:.2f} edges={}; mean_matcher_mem={}".format(
+                    current_time, num_ancestors_in_epoch, extra_nodes,
+                    np.sum(self.mean_traceback_size) / np.sum(self.num_matches),
+                    self.tree_sequence_builder.num_edges,
+                    humanize.naturalsize(mean_memory, binary=True)))
         self.mean_traceback_size[:] = 0
         self.num_matches[:] = 0
         self.results.clear()
 
     def __match_ancestors_single_threaded(self):
-        for j in range(self.start_epoch, self.num_epochs):
-            self.__start_epoch(j)
-            start, end = map(int, self.epoch_slices[j])
-            for ancestor_id in range(start, end):
-                a = next(self.ancestors)
-                assert ancestor_id == a.id
-                self.__ancestor_find_path(a)
-            self.__complete_epoch(j)
+        # Read and decompress the next ancestors while matching the current one.
+        with threads.PrefetchIterator(
+                self.ancestors, name="ancestor-reader") as ancestors:
+            for j in range(self.start_epoch, self.num_epochs):
+                self.__start_epoch(j)
+                start, end = self.epoch_start[j], self.epoch_end[j]
+                for ancestor_id in range(start, end):
+                    a = next(ancestors)
+                    assert ancestor_id == a.id
+                    self.__ancestor_find_path(a)
+                self.__complete_epoch(j)
 
     def __match_ancestors_multi_threaded(self, start_epoch=1):
         # See note on match samples multithreaded below. Should combine these
@@ -958,7 +1003,8 @@ class AncestorMatcher(Matcher):
                 work = match_queue.get()
                 if work is None:
                     break
-                self.__ancestor_find_path(work, thread_index)
+                for a in work:
+                    self.__ancestor_find_path(a, thread_index)
                 match_queue.task_done()
             match_queue.task_done()
 
@@ -969,16 +1015,31 @@ class AncestorMatcher(Matcher):
             for j in range(self.num_threads)]
         logger.debug("Started {} match worker threads".format(self.num_threads))
 
-        for j in range(self.start_epoch, self.num_epochs):
-            self.__start_epoch(j)
-            start, end = map(int, self.epoch_slices[j])
-            for ancestor_id in range(start, end):
-                a = next(self.ancestors)
-                assert a.id == ancestor_id
-                match_queue.put(a)
-            # Block until all matches have completed.
-            match_queue.join()
-            self.__complete_epoch(j)
+        # Ancestors are read and decompressed by a separate thread, so that
+        # reading the next epoch's haplotypes overlaps with waiting for the
+        # matches in the current epoch to complete.
+        with threads.PrefetchIterator(
+                self.ancestors, buffer_size=queue_depth,
+                name="ancestor-reader") as ancestors:
+            for j in range(self.start_epoch, self.num_epochs):
+                self.__start_epoch(j)
+                start, end = self.epoch_start[j], self.epoch_end[j]
+                # Hand out ancestors in batches to reduce queue synchronisation,
+                # while keeping enough batches per thread to balance the load.
+                batch_size = max(1, (end - start) // (4 * self.num_threads))
+                batch = []
+                for ancestor_id in range(start, end):
+                    a = next(ancestors)
+                    assert a.id == ancestor_id
+                    batch.append(a)
+                    if len(batch) == batch_size:
+                        match_queue.put(batch)
+                        batch = []
+                if len(batch) > 0:
+                    match_queue.put(batch)
+                # Block until all matches have completed.
+                match_queue.join()
+                self.__complete_epoch(j)
 
         # Stop the the worker threads.
         for j in range(self.num_threads):
@@ -1025,9 +1086,11 @@ class SampleMatcher(Matcher):
         self.results.set_mutations(sample_id, diffs.astype(np.int32), derived_state)
 
     def __match_samples_single_threaded(self, indexes):
-        sample_haplotypes = self.sample_data.haplotypes(indexes, inference_sites=True)
-        for j, a in sample_haplotypes:
-            self.__process_sample(self.sample_ids[j], a)
+        with threads.PrefetchIterator(
+                self.sample_data.haplotypes(indexes, inference_sites=True),
+                name="sample-reader") as sample_haplotypes:
+            for j, a in sample_haplotypes:
+                self.__process_sample(self.sample_ids[j], a)
 
     def __match_samples_multi_threaded(self, indexes):
         # Note that this function is not almost identical to the match_ancestors
@@ -1105,10 +1168,17 @@ class SampleMatcher(Matcher):
                 # tree sequences produced by perfect inference.
                 tables = ts.dump_tables()
                 times = tables.nodes.time
-                for t in range(1, int(times[0])):
-                    index = np.where(times == t)[0]
-                    k = index.shape[0]
-                    times[index] += np.arange(k)[::-1] / k
+                # Group the nodes at each integer timepoint in one pass rather
+                # than scanning the full time array once per timepoint.
+                index = np.where(
+                    (times >= 1) & (times < int(times[0])) &
+                    (times == np.floor(times)))[0]
+                index = index[np.argsort(times[index], kind="stable")]
+                _, group_start, group_size = np.unique(
+                    times[index], return_index=True, return_counts=True)
+                k = np.repeat(group_size, group_size)
+                offset = np.arange(index.shape[0]) - np.repeat(group_start, group_size)
+                times[index] += (k - 1 - offset) / k
                 tables.nodes.set_columns(flags=tables.nodes.flags, time=times)
                 tables.sort()
                 ts = tables.tree_sequence()
@@ -1152,6 +1222,27 @@ class ResultBuffer(object):
     def get_path(self, node_id):
         return self.paths[node_id]
 
+    def get_paths(self, node_ids):
+        """
+        Returns the paths for the specified nodes concatenated into left, right
+        and parent arrays, along with an offset array such that the edges for
+        node_ids[j] are in positions offset[j] to offset[j + 1].
+        """
+        paths = [self.paths[node_id] for node_id in node_ids]
+        offset = np.zeros(len(paths) + 1, dtype=np.int64)
+        offset[1:] = np.cumsum([len(left) for left, _, _ in paths])
+        num_edges = offset[-1]
+        left = np.empty(num_edges, dtype=np.uint32)
+        right = np.empty(num_edges, dtype=np.uint32)
+        parent = np.empty(num_edges, dtype=np.int32)
+        if len(paths) > 0:
+            # Copy each column with a single call rather than one per path.
+            lefts, rights, parents = zip(*paths)
+            np.concatenate(lefts, out=left)
+            np.concatenate(rights, out=right)
+            np.concatenate(parents, out=parent)
+        return left, right, parent, offset
+
     def get_mutations(self, node_id):
         return self.mutations[node_id]
 
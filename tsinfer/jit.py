@@ -0,0 +1,119 @@
+#
+# Copyright (C) 2018 University of Oxford
+#
+# This file is part of tsinfer.
+#
+# tsinfer is free software: you can redistribute it and/or modify
+# it under the terms of the GNU General Public License as published by
+# the Free Software Foundation, either version 3 of the License, or
+# (at your option) any later version.
+#
+# tsinfer is distributed in the hope that it will be useful,
+# but WITHOUT ANY WARRANTY; without even the implied warranty of
+# MERCHANTABILITY or FITNESS FOR A PARTICULAR PURPOSE.  See the
+# GNU General Public License for more details.
+#
+# You should have received a copy of the GNU General Public License
+# along with tsinfer.  If not, see <http://www.gnu.org/licenses/>.
+#
+"""
+Numba-friendly access to the state of a tree sequence builder.
+
+This module is an optional extra and requires numba, which can be installed
+using ``pip install tsinfer[jit]``. It provides flat, contiguous numpy views
+of the nodes, edges and mutations held by a TreeSequenceBuilder, which can be
+passed directly into ``numba.njit`` compiled functions, along with a few
+reference kernels that show how to work with them.
+"""
+import attr
+import numpy as np
+
+try:
+    import numba
+except ImportError:
+    raise ImportError(
+        "The tsinfer.jit module requires numba. Please install it using "
+        "'pip install tsinfer[jit]' or 'pip install numba'")
+
+
+@attr.s(frozen=True)
+class TreeSequenceBuilderView(object):
+    """
+    A snapshot of the nodes, edges and mutations in a TreeSequenceBuilder as
+    contiguous numpy arrays. Edge coordinates are in units of site indexes, and
+    the edges are sorted by child ID, then by left coordinate.
+    """
+    num_sites = attr.ib()
+    node_flags = attr.ib()
+    node_time = attr.ib()
+    edge_left = attr.ib()
+    edge_right = attr.ib()
+    edge_parent = attr.ib()
+    edge_child = attr.ib()
+    mutation_site = attr.ib()
+    mutation_node = attr.ib()
+    mutation_derived_state = attr.ib()
+    mutation_parent = attr.ib()
+
+    @property
+    def num_nodes(self):
+        return self.node_time.shape[0]
+
+    @property
+    def num_edges(self):
+        return self.edge_left.shape[0]
+
+    @property
+    def num_mutations(self):
+        return self.mutation_site.shape[0]
+
+    @classmethod
+    def from_builder(cls, tree_sequence_builder):
+        """
+        Returns a view of the specified tree sequence builder, which may be
+        either the C or the Python implementation. The arrays are copies of
+        the builder's state at the time of the call.
+        """
+        tsb = tree_sequence_builder
+        flags, time = tsb.dump_nodes()
+        left, right, parent, child = tsb.dump_edges()
+        site, node, derived_state, mutation_parent = tsb.dump_mutations()
+        return cls(
+            num_sites=tsb.num_sites,
+            node_flags=np.ascontiguousarray(flags, dtype=np.uint32),
+            node_time=np.ascontiguousarray(time, dtype=np.float64),
+            edge_left=np.ascontiguousarray(left, dtype=np.int32),
+            edge_right=np.ascontiguousarray(right, dtype=np.int32),
+            edge_parent=np.ascontiguousarray(parent, dtype=np.int32),
+            edge_child=np.ascontiguousarray(child, dtype=np.int32),
+            mutation_site=np.ascontiguousarray(site, dtype=np.int32),
+            mutation_node=np.ascontiguousarray(node, dtype=np.int32),
+            mutation_derived_state=np.ascontiguousarray(derived_state, dtype=np.int8),
+            mutation_parent=np.ascontiguousarray(mutation_parent, dtype=np.int32))
+
+
+@numba.njit(cache=True)
+def child_edge_offsets(edge_child, num_nodes):
+    """
+    Returns an array of num_nodes + 1 offsets such that the edges for child u
+    are edge_child[offsets[u]: offsets[u + 1]]. Requires that the edges are
+    sorted by ascending child ID, as they are in a TreeSequenceBuilderView.
+    """
+    offsets = np.zeros(num_nodes + 1, dtype=np.int64)
+    for j in range(edge_child.shape[0]):
+        offsets[edge_child[j] + 1] += 1
+    for u in range(num_nodes):
+        offsets[u + 1] += offsets[u]
+    return offsets
+
+
+@numba.njit(cache=True)
+def parent_at_site(edge_left, edge_right, edge_parent, offsets, child, site):
+    """
+    Returns the parent of the specified child node at the specified site, or
+    -1 if the child has no parent there.
+    """
+    for j in range(offsets[child], offsets[child + 1]):
+        if edge_left[j] <= site < edge_right[j]:
+            return edge_parent[j]
+    return -1
@@ -20,6 +20,7 @@
 Utilities for handling threads.
 """
 import logging
+import queue
 import threading
 import traceback
 import _thread
@@ -98,3 +99,89 @@ def queue_consumer_thread(worker, work_queue, name="tsinfer-worker", index=0):
     specified worker function.
     """
     return _queue_thread(worker, work_queue, name=name, index=index, consumer=True)
+
+
+class _PrefetchError(object):
+    """
+    Wraps an exception raised by the iterator in a PrefetchIterator's reader
+    thread, so that it can be passed back through the queue.
+    """
+    def __init__(self, exception):
+        self.exception = exception
+
+
+class PrefetchIterator(object):
+    """
+    Iterates over the items of the specified iterator, which are read ahead by
+    a background thread into a queue holding at most buffer_size items. This
+    allows the cost of producing items (such as decompressing them from a zarr
+    store) to overlap with the work done on them by the caller. Any exception
+    raised by the wrapped iterator is re-raised in the caller when the item it
+    prevented from being read is requested.
+
+    If iteration may stop before the wrapped iterator is exhausted, call
+    :meth:`close` (or use the iterator as a context manager) to stop the
+    reader thread and release the wrapped iterator.
+    """
+    _END = object()
+
+    def __init__(self, iterator, buffer_size=8, name="prefetch-worker"):
+        self._iterator = iterator
+        self._queue = queue.Queue(buffer_size)
+        self._stop = threading.Event()
+        self._finished = False
+        self._name = name
+        self._thread = threading.Thread(target=self._worker, daemon=True)
+        self._thread.start()
+
+    def _worker(self):
+        logger.debug("thread '{}' starting".format(self._name))
+        if _prctl_available:
+            prctl.set_name(self._name)
+        try:
+            for item in self._iterator:
+                self._queue.put(item)
+                if self._stop.is_set():
+                    break
+            else:
+                self._queue.put(self._END)
+        except Exception as e:
+            self._queue.put(_PrefetchError(e))
+        logger.debug("thread '{}' finishing".format(self._name))
+
+    def __iter__(self):
+        return self
+
+    def __next__(self):
+        if self._finished:
+            raise StopIteration
+        item = self._queue.get()
+        if item is self._END or isinstance(item, _PrefetchError):
+            self._finished = True
+            self._thread.join()
+            self._iterator = None
+            if item is self._END:
+                raise StopIteration
+            raise item.exception
+        return item
+
+    def close(self):
+        """
+        Stops the reader thread, discarding any items that have been read
+        ahead, and releases the wrapped iterator.
+        """
+        self._finished = True
+        self._stop.set()
+        while self._thread.is_alive():
+            # Make room in the queue so that a blocked reader can finish.
+            try:
+                self._queue.get(timeout=0.01)
+            except queue.Empty:
+                pass
+        self._iterator = None
+
+    def __enter__(self):
+        return self
+
+    def __exit__(self, *args):
+        self.close()